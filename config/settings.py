@@ -20,6 +20,9 @@ DISCORD_PREMIUM_ROLE_ID = os.getenv("DISCORD_PREMIUM_ROLE_ID")
 # === DATABASE ===
 DATABASE_PATH = os.getenv("DATABASE_PATH", "data/smartmoney.db")
 
+# === CACHE ===
+CACHE_DIR = os.getenv("CACHE_DIR", "data/cache")
+
 # === FEATURE FLAGS ===
 TWITTER_ENABLED = os.getenv("TWITTER_ENABLED", "true").lower() == "true"
 DISCORD_ENABLED = os.getenv("DISCORD_ENABLED", "true").lower() == "true"
@@ -3,7 +3,6 @@ Anomaly detection for insider trades.
 Identifies unusual patterns that indicate newsworthy activity.
 """
 
-import json
 import os
 import sys
 from datetime import datetime, timedelta
@@ -11,10 +10,10 @@ from typing import List, Dict, Optional
 
 # Handle imports for both module and direct execution
 try:
-    from core.database import get_recent_trades_for_ticker, get_insider_history
+    from core.database import get_recent_trades_for_ticker, get_insider_history, to_json
 except ImportError:
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from core.database import get_recent_trades_for_ticker, get_insider_history
+    from core.database import get_recent_trades_for_ticker, get_insider_history, to_json
 
 
 class TradeAnalyzer:
@@ -262,7 +261,7 @@ class TradeAnalyzer:
                 anomalies.append('director_buy')
 
         # Add to trade dict
-        trade['anomalies'] = json.dumps(anomalies)
+        trade['anomalies'] = to_json(anomalies)
         trade['anomaly_texts'] = anomaly_texts
         trade['is_bullish'] = is_purchase and len([a for a in anomalies if 'buy' in a or 'purchase' in a]) > 0
         trade['is_bearish'] = is_sale and len([a for a in anomalies if 'sale' in a or 'sell' in a or 'exit' in a or 'reduction' in a]) > 0
@@ -17,6 +17,21 @@ except ImportError:
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from config.settings import DATABASE_PATH
 
+# orjson is much faster at encoding; fall back to stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+
+def to_json(value) -> str:
+    """Serialize a value to a JSON string for storage."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value).decode()
+    return json.dumps(value)
+
 
 def get_connection():
     """Get database connection with row factory."""
@@ -340,10 +355,10 @@ def insert_hedge_fund_filing(filing_data: Dict) -> Optional[int]:
             filing_data.get('fund_name'),
             filing_data.get('fund_cik'),
             filing_data.get('manager_name'),
-            json.dumps(top_holdings),  # Store top holdings as new_positions for now
-            json.dumps([]),  # increased_positions - would need historical comparison
-            json.dumps([]),  # decreased_positions - would need historical comparison
-            json.dumps([]),  # exited_positions - would need historical comparison
+            to_json(top_holdings),  # Store top holdings as new_positions for now
+            to_json([]),  # increased_positions - would need historical comparison
+            to_json([]),  # decreased_positions - would need historical comparison
+            to_json([]),  # exited_positions - would need historical comparison
             filing_data.get('total_value', 0),
             filing_data.get('position_count', 0) or len(holdings),
             filing_data.get('virality_score', 0),
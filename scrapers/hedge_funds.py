@@ -11,7 +11,9 @@ from bs4 import BeautifulSoup
 import xml.etree.ElementTree as ET
 import re
 import time
-import json
+import heapq
+from bisect import bisect_right
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 import os
@@ -19,12 +21,18 @@ import sys
 
 # Handle imports
 try:
-    from config.settings import SEC_USER_AGENT, SEC_BASE_URL
-    from config.tickers import SP500, MEME_STOCKS, MAGNIFICENT_7
+    from config.settings import SEC_USER_AGENT, SEC_BASE_URL, TIER1_SCORE, TIER2_SCORE, TIER3_SCORE
+    from config.tickers import SP500, MEME_STOCKS, MAGNIFICENT_7, COMPANY_ALIASES
+    from utils.cache import DiskCache, create_sec_session
+    from utils.rate_limiter import sec_limiter
+    from utils.helpers import strip_company_suffixes
 except ImportError:
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from config.settings import SEC_USER_AGENT, SEC_BASE_URL
-    from config.tickers import SP500, MEME_STOCKS, MAGNIFICENT_7
+    from config.settings import SEC_USER_AGENT, SEC_BASE_URL, TIER1_SCORE, TIER2_SCORE, TIER3_SCORE
+    from config.tickers import SP500, MEME_STOCKS, MAGNIFICENT_7, COMPANY_ALIASES
+    from utils.cache import DiskCache, create_sec_session
+    from utils.rate_limiter import sec_limiter
+    from utils.helpers import strip_company_suffixes
 
 
 # Famous investors/funds to track
@@ -52,28 +60,151 @@ FAMOUS_FUNDS = {
 # CIKs of famous funds for quick lookup
 FAMOUS_CIKS = {v["cik"]: k for k, v in FAMOUS_FUNDS.items()}
 
+# Lowercased fund names for title matching
+_FAMOUS_LOWER_KEYS = tuple((k.lower(), k, v) for k, v in FAMOUS_FUNDS.items())
+
+# Precompiled patterns for filing index pages
+_ACCESSION_RE = re.compile(r'/(\d{10}-\d{2}-\d{6})')
+_FILING_DATE_RE = re.compile(r'Filing Date', re.I)
+_PERIOD_RE = re.compile(r'Period of Report', re.I)
+_DATE_RE = re.compile(r'(\d{4}-\d{2}-\d{2})')
+_PARENS_RE = re.compile(r'\s*\(.*?\)')
+
+# infoTable field tag -> (holding key, converter)
+_FIELD_HANDLERS = {
+    'nameofissuer': ('company_name', str.strip),
+    'titleofclass': ('title', str.strip),
+    'cusip': ('cusip', str.strip),
+    'value': ('value', lambda t: int(t) * 1000),  # Value is in thousands
+    'sshprnamt': ('shares', int),
+    'sshprnamttype': ('share_type', str.strip),
+}
+
+# Scoring tables: (minimum, points), highest threshold first
+_PORTFOLIO_THRESHOLDS = (
+    (50_000_000_000, 25),
+    (10_000_000_000, 20),
+    (1_000_000_000, 15),
+    (100_000_000, 10),
+)
+_POSITION_THRESHOLDS = (
+    (100, 10),
+    (50, 5),
+)
+
+# Tier lookup: bisect_right(_TIER_CUTS, score) indexes into _TIER_MAP
+_TIER_CUTS = (TIER3_SCORE, TIER2_SCORE, TIER1_SCORE)
+_TIER_MAP = (4, 3, 2, 1)
+
+
+def _normalize_company(name: str) -> str:
+    """Uppercase a company name and strip trailing corporate suffixes."""
+    return strip_company_suffixes(name.upper())
+
+
+# COMPANY_ALIASES with keys normalized once at import
+_NORMALIZED_ALIASES = tuple((_normalize_company(alias), ticker) for alias, ticker in COMPANY_ALIASES.items())
+_ALIAS_TICKERS = dict(_NORMALIZED_ALIASES)
+
+
+@lru_cache(maxsize=50_000)
+def _lookup_ticker(company_name: str) -> Optional[str]:
+    """Match a company name to a ticker. Cached since funds share most holdings."""
+    name = _normalize_company(company_name)
+
+    ticker = _ALIAS_TICKERS.get(name)
+    if ticker:
+        return ticker
+
+    for alias, ticker in _NORMALIZED_ALIASES:
+        if alias in name:
+            return ticker
+
+    return None
+
+
+# RSS feeds change constantly, so only reuse them briefly
+FEED_CACHE_SECONDS = 300
+
+# Parsed filings are kept well past the feed's window, then expire
+FILING_CACHE_SECONDS = 7 * 24 * 3600
+
 
 class HedgeFundScraper:
     """Scraper for SEC 13F filings."""
 
     def __init__(self):
-        self.session = requests.Session()
+        self.session = create_sec_session()
         self.session.headers.update({
             'User-Agent': SEC_USER_AGENT,
             'Accept-Encoding': 'gzip, deflate',
         })
         self.base_url = "https://www.sec.gov"
         self.rss_url = "https://www.sec.gov/cgi-bin/browse-edgar?action=getcurrent&type=13F-HR&company=&dateb=&owner=include&count=100&output=atom"
+        # Plain session for large documents that are streamed, not cached
+        self.stream_session = requests.Session()
+        self.stream_session.headers.update(self.session.headers)
+        # 13F filings are immutable once filed, so parsed results never go stale
+        self.cache = DiskCache('13f')
+
+    def _get(self, url: str, cached: bool = True, **kwargs) -> requests.Response:
+        """
+        GET a URL, waiting on the shared SEC rate limiter (10 req/sec) first.
+        Fresh HTTP cache hits never reach the SEC, so they skip the wait.
+        With cached=False the request skips the HTTP cache.
+        """
+        if not cached:
+            sec_limiter.wait()
+            return self.stream_session.get(url, **kwargs)
+
+        if hasattr(self.session, 'cache'):
+            # Returns a 504 instead of sending a request when nothing is cached
+            response = self.session.get(url, only_if_cached=True, **kwargs)
+            if response.status_code != 504 and not response.is_expired:
+                return response
+
+        sec_limiter.wait()
+        return self.session.get(url, **kwargs)
+
+    def _get_cached(self, url: str, max_age: int = FEED_CACHE_SECONDS) -> bytes:
+        """
+        GET a URL through the disk cache.
+        Fresh entries are returned without a request; stale ones are
+        revalidated with ETag/Last-Modified so unchanged feeds come back as 304.
+        """
+        key = f"http:{url}"
+        entry = self.cache.get(key)
+        if entry and time.time() - entry['fetched_at'] < max_age:
+            return entry['content']
+
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self._get(url, headers=headers, timeout=30)
+        if response.status_code == 304 and entry:
+            content = entry['content']
+        else:
+            response.raise_for_status()
+            content = response.content
+
+        self.cache.set(key, {
+            'content': content,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+        })
+        return content
 
     def scrape_recent_filings(self, max_filings: int = 50) -> List[Dict]:
         """Scrape recent 13F filings from SEC RSS feed."""
         print(f"Scraping up to {max_filings} recent 13F filings...")
 
         try:
-            response = self.session.get(self.rss_url, timeout=30)
-            response.raise_for_status()
-
-            root = ET.fromstring(response.content)
+            root = ET.fromstring(self._get_cached(self.rss_url))
             ns = {'atom': 'http://www.w3.org/2005/Atom'}
             entries = root.findall('.//atom:entry', ns)
 
@@ -96,8 +227,9 @@ class HedgeFundScraper:
                     fund_name = None
                     manager_name = None
 
-                    for fund_key, fund_info in FAMOUS_FUNDS.items():
-                        if fund_key.lower() in title.lower():
+                    title_lower = title.lower()
+                    for key_lower, fund_key, fund_info in _FAMOUS_LOWER_KEYS:
+                        if key_lower in title_lower:
                             is_famous = True
                             fund_name = fund_key
                             manager_name = fund_info["manager"]
@@ -110,8 +242,6 @@ class HedgeFundScraper:
                         status = "⭐ FAMOUS" if is_famous else ""
                         print(f"  [{i+1}] {filing.get('fund_name', 'Unknown')[:30]} {status}")
 
-                    time.sleep(0.15)  # Rate limit
-
                 except Exception as e:
                     print(f"Error parsing 13F entry {i+1}: {e}")
                     continue
@@ -136,11 +266,12 @@ class HedgeFundScraper:
                 # Get recent filings for this CIK
                 url = f"https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&CIK={cik}&type=13F-HR&dateb=&owner=include&count=5&output=atom"
 
-                response = self.session.get(url, timeout=30)
-                if response.status_code != 200:
+                try:
+                    content = self._get_cached(url)
+                except requests.RequestException:
                     continue
 
-                root = ET.fromstring(response.content)
+                root = ET.fromstring(content)
                 ns = {'atom': 'http://www.w3.org/2005/Atom'}
                 entries = root.findall('.//atom:entry', ns)
 
@@ -154,8 +285,6 @@ class HedgeFundScraper:
                             filings.append(filing)
                             print(f"  ⭐ {manager}: {filing.get('position_count', 0)} positions")
 
-                time.sleep(0.2)
-
             except Exception as e:
                 print(f"Error scraping {fund_name}: {e}")
                 continue
@@ -166,63 +295,46 @@ class HedgeFundScraper:
                       fund_name: str = None, manager_name: str = None) -> Optional[Dict]:
         """Parse a 13F filing to extract holdings."""
         try:
-            response = self.session.get(filing_url, timeout=30)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'lxml')
+            # Extract accession number
+            accession_match = _ACCESSION_RE.search(filing_url)
+            accession_number = accession_match.group(1) if accession_match else None
+
+            # Filings never change once filed - reuse a previous parse if we have one
+            if accession_number:
+                cached = self.cache.get(f"filing:{accession_number}")
+                if cached is not None:
+                    cached['filing_url'] = filing_url
+                    cached['is_famous'] = is_famous
+                    if fund_name:
+                        cached['fund_name'] = fund_name
+                        cached['manager_name'] = manager_name
+                    return cached
 
             # Extract fund name from title if not provided
             if not fund_name:
                 fund_name = title.split(' - ')[0] if ' - ' in title else title
-                fund_name = re.sub(r'\s*\(.*?\)', '', fund_name).strip()
-
-            # Find the information table XML
-            xml_link = None
-            table = soup.find('table', class_='tableFile')
-            if table:
-                for row in table.find_all('tr'):
-                    cells = row.find_all('td')
-                    if len(cells) >= 4:
-                        doc_type = cells[3].get_text(strip=True) if len(cells) > 3 else ''
-                        if 'INFORMATION TABLE' in doc_type.upper() or 'INFOTABLE' in doc_type.upper():
-                            link = cells[2].find('a')
-                            if link:
-                                href = link.get('href', '')
-                                if href.endswith('.xml'):
-                                    xml_link = self.base_url + href if href.startswith('/') else href
-                                    break
+                fund_name = _PARENS_RE.sub('', fund_name).strip()
+
+            # One request for the index page gives the XML link and both dates
+            xml_link, filing_date, report_date = self._parse_filing_index(filing_url)
 
             # Parse holdings from XML
             holdings = []
             total_value = 0
+            complete = False
 
             if xml_link:
-                holdings, total_value = self._parse_holdings_xml(xml_link)
-
-            # Extract accession number
-            accession_match = re.search(r'/(\d{10}-\d{2}-\d{6})', filing_url)
-            accession_number = accession_match.group(1) if accession_match else None
-
-            # Get filing date
-            filing_date = datetime.now().strftime('%Y-%m-%d')
-            date_elem = soup.find(string=re.compile(r'Filing Date', re.I))
-            if date_elem:
-                date_match = re.search(r'(\d{4}-\d{2}-\d{2})', str(date_elem.parent))
-                if date_match:
-                    filing_date = date_match.group(1)
-
-            # Get report date (quarter end)
-            report_date = None
-            report_elem = soup.find(string=re.compile(r'Period of Report', re.I))
-            if report_elem:
-                date_match = re.search(r'(\d{4}-\d{2}-\d{2})', str(report_elem.parent))
-                if date_match:
-                    report_date = date_match.group(1)
+                parsed = self._parse_holdings_xml(xml_link)
+                if parsed is not None:
+                    holdings, total_value = parsed
+                    complete = True
 
             # Identify new, increased, decreased, exited positions
             # (Would need previous quarter's data for comparison - simplified here)
-            top_holdings = sorted(holdings, key=lambda x: x.get('value', 0), reverse=True)[:20]
+            # Only the top 10 are kept, so select them without sorting the whole portfolio
+            top_holdings = heapq.nlargest(10, holdings, key=lambda x: x.get('value', 0))
 
-            return {
+            filing = {
                 'accession_number': accession_number,
                 'filing_date': filing_date,
                 'report_date': report_date,
@@ -232,61 +344,110 @@ class HedgeFundScraper:
                 'is_famous': is_famous,
                 'total_value': total_value,
                 'position_count': len(holdings),
-                'top_holdings': json.dumps(top_holdings[:10]),
+                'top_holdings': top_holdings,
                 'holdings': holdings,  # Full list for analysis
             }
 
+            # Only cache complete parses so transient XML failures get retried
+            if accession_number and complete and holdings:
+                self.cache.set(f"filing:{accession_number}", filing, expire=FILING_CACHE_SECONDS)
+
+            return filing
+
         except Exception as e:
             print(f"Error parsing 13F filing {filing_url}: {e}")
             return None
 
-    def _parse_holdings_xml(self, xml_url: str) -> Tuple[List[Dict], float]:
-        """Parse 13F information table XML."""
+    def _parse_filing_index(self, filing_url: str) -> Tuple[Optional[str], str, Optional[str]]:
+        """
+        Scrape the HTML filing index page.
+        Returns (xml_link, filing_date, report_date).
+        """
+        response = self._get(filing_url, timeout=30)
+        response.raise_for_status()
+        soup = BeautifulSoup(response.content, 'lxml')
+
+        # Find the information table XML
+        xml_link = None
+        table = soup.find('table', class_='tableFile')
+        if table:
+            for row in table.find_all('tr'):
+                cells = row.find_all('td')
+                if len(cells) >= 4:
+                    doc_type = cells[3].get_text(strip=True) if len(cells) > 3 else ''
+                    if 'INFORMATION TABLE' in doc_type.upper() or 'INFOTABLE' in doc_type.upper():
+                        link = cells[2].find('a')
+                        if link:
+                            href = link.get('href', '')
+                            if href.endswith('.xml'):
+                                xml_link = self.base_url + href if href.startswith('/') else href
+                                break
+
+        # Get filing date
+        filing_date = datetime.now().strftime('%Y-%m-%d')
+        date_elem = soup.find(string=_FILING_DATE_RE)
+        if date_elem:
+            date_match = _DATE_RE.search(str(date_elem.parent))
+            if date_match:
+                filing_date = date_match.group(1)
+
+        # Get report date (quarter end)
+        report_date = None
+        report_elem = soup.find(string=_PERIOD_RE)
+        if report_elem:
+            date_match = _DATE_RE.search(str(report_elem.parent))
+            if date_match:
+                report_date = date_match.group(1)
+
+        return xml_link, filing_date, report_date
+
+    def _parse_holdings_xml(self, xml_url: str) -> Optional[Tuple[List[Dict], float]]:
+        """
+        Parse 13F information table XML.
+        Returns (holdings, total_value), or None if the document could not be
+        fetched or parsed completely - partial results are discarded.
+        """
         holdings = []
         total_value = 0
 
         try:
-            response = self.session.get(xml_url, timeout=30)
-            response.raise_for_status()
-
-            root = ET.fromstring(response.content)
-
-            # Find all info table entries
-            for entry in root.iter():
-                if 'infotable' in entry.tag.lower():
-                    holding = {}
-
-                    for child in entry:
-                        tag = child.tag.split('}')[-1].lower()  # Remove namespace
-
-                        if 'nameofissuer' in tag:
-                            holding['company_name'] = child.text
-                        elif 'titleofclass' in tag:
-                            holding['title'] = child.text
-                        elif 'cusip' in tag:
-                            holding['cusip'] = child.text
-                        elif 'value' in tag:
-                            try:
-                                # Value is in thousands
-                                holding['value'] = int(child.text) * 1000
-                                total_value += holding['value']
-                            except:
-                                pass
-                        elif 'sshprnamt' in tag:
-                            try:
-                                holding['shares'] = int(child.text)
-                            except:
-                                pass
-                        elif 'sshprnamttype' in tag:
-                            holding['share_type'] = child.text
-
-                    if holding.get('company_name'):
-                        # Try to get ticker
-                        holding['ticker'] = self._match_ticker(holding.get('company_name', ''))
-                        holdings.append(holding)
+            # Stream the body into the parser instead of buffering the whole document.
+            # The HTTP cache would read the whole body first, so bypass it here;
+            # the parsed filing is cached by accession number instead.
+            # The with block returns the connection to the pool even on errors.
+            with self._get(xml_url, cached=False, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True  # Undo gzip transfer encoding
+
+                # Handle each info table entry as soon as it is complete
+                for _, entry in ET.iterparse(response.raw):
+                    if 'infotable' in entry.tag.lower():
+                        holding = {}
+
+                        # Shares live under <shrsOrPrnAmt>, so walk nested fields too
+                        for child in entry.iter():
+                            tag = child.tag.split('}')[-1].lower()  # Remove namespace
+                            handler = _FIELD_HANDLERS.get(tag)
+                            if handler:
+                                key, convert = handler
+                                try:
+                                    holding[key] = convert(child.text)
+                                except (TypeError, ValueError):
+                                    pass
+
+                        total_value += holding.get('value', 0)
+
+                        if holding.get('company_name'):
+                            # Try to get ticker
+                            holding['ticker'] = self._match_ticker(holding.get('company_name', ''))
+                            holdings.append(holding)
+
+                        # Free the parsed subtree; large funds report thousands of entries
+                        entry.clear()
 
         except Exception as e:
             print(f"Error parsing holdings XML {xml_url}: {e}")
+            return None
 
         return holdings, total_value
 
@@ -295,20 +456,7 @@ class HedgeFundScraper:
         if not company_name:
             return None
 
-        from config.tickers import COMPANY_ALIASES
-
-        name_upper = company_name.upper().strip()
-
-        # Remove common suffixes
-        for suffix in [' INC', ' CORP', ' CO', ' LTD', ' LLC', ' CLASS A', ' CLASS B', ' COM']:
-            name_upper = name_upper.replace(suffix, '')
-
-        # Check aliases
-        for alias, ticker in COMPANY_ALIASES.items():
-            if alias.replace(' INC', '').replace(' CORP', '') in name_upper:
-                return ticker
-
-        return None
+        return _lookup_ticker(company_name)
 
 
 class HedgeFundAnalyzer:
@@ -335,13 +483,7 @@ class HedgeFundAnalyzer:
             anomaly_texts.append(f"${total_value/1e9:.1f}B portfolio")
 
         # Check top holdings for interesting stocks
-        top_holdings = filing.get('top_holdings', '[]')
-        if isinstance(top_holdings, str):
-            try:
-                top_holdings = json.loads(top_holdings)
-            except:
-                top_holdings = []
-
+        top_holdings = filing.get('top_holdings', [])
         for holding in top_holdings[:5]:
             ticker = holding.get('ticker', '')
             if ticker in MEME_STOCKS:
@@ -352,7 +494,8 @@ class HedgeFundAnalyzer:
                 anomalies.append('mag7_holding')
                 break
 
-        filing['anomalies'] = json.dumps(anomalies)
+        # Kept as a list - serialized to JSON only when persisted
+        filing['anomalies'] = anomalies
         filing['anomaly_texts'] = anomaly_texts
 
         return filing
@@ -373,25 +516,10 @@ class HedgeFundScorer:
 
         # Portfolio size (max 25)
         total_value = filing.get('total_value', 0)
-        if total_value >= 50_000_000_000:
-            score += 25
-        elif total_value >= 10_000_000_000:
-            score += 20
-        elif total_value >= 1_000_000_000:
-            score += 15
-        elif total_value >= 100_000_000:
-            score += 10
-        else:
-            score += 5
+        score += next((pts for thr, pts in _PORTFOLIO_THRESHOLDS if total_value >= thr), 5)
 
         # Anomalies (max 25)
-        anomalies = filing.get('anomalies', '[]')
-        if isinstance(anomalies, str):
-            try:
-                anomalies = json.loads(anomalies)
-            except:
-                anomalies = []
-
+        anomalies = filing.get('anomalies', [])
         if 'meme_stock_holding' in anomalies:
             score += 15
         if 'famous_fund' in anomalies:
@@ -399,10 +527,7 @@ class HedgeFundScorer:
 
         # Position count suggests active trading
         position_count = filing.get('position_count', 0)
-        if position_count >= 100:
-            score += 10
-        elif position_count >= 50:
-            score += 5
+        score += next((pts for thr, pts in _POSITION_THRESHOLDS if position_count >= thr), 0)
 
         return min(score, 100)
 
@@ -420,14 +545,14 @@ def scrape_hedge_fund_filings(max_filings: int = 50, famous_only: bool = False)
     else:
         filings = hedge_fund_scraper.scrape_recent_filings(max_filings)
 
-    analyzed_filings = []
+    # Analysis is cheap next to the HTTP work above, so score in place in one pass
     for filing in filings:
-        filing = hedge_fund_analyzer.analyze(filing)
-        filing['virality_score'] = hedge_fund_scorer.score(filing)
-        filing['tier'] = 1 if filing['virality_score'] >= 70 else 2 if filing['virality_score'] >= 50 else 3 if filing['virality_score'] >= 30 else 4
-        analyzed_filings.append(filing)
+        hedge_fund_analyzer.analyze(filing)
+        score = hedge_fund_scorer.score(filing)
+        filing['virality_score'] = score
+        filing['tier'] = _TIER_MAP[bisect_right(_TIER_CUTS, score)]
 
-    return analyzed_filings
+    return filings
 
 
 if __name__ == "__main__":
@@ -449,9 +574,7 @@ if __name__ == "__main__":
         print(f"  Score: {filing.get('virality_score')}/100 (Tier {filing.get('tier')})")
 
         # Show top holdings
-        top = filing.get('top_holdings', '[]')
-        if isinstance(top, str):
-            top = json.loads(top)
+        top = filing.get('top_holdings', [])
         if top:
             print(f"  Top Holdings:")
             for h in top[:3]:
@@ -6,12 +6,14 @@ Form 4 = Insider trading disclosure
 - Contains: insider info, company, transaction details
 """
 
-import requests
-import xml.etree.ElementTree as ET
+import aiohttp
+import asyncio
+from lxml import etree
+import lxml.html
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+import json
 import re
-import time
+from functools import lru_cache
 from typing import List, Dict, Optional
 import os
 import sys
@@ -20,150 +22,389 @@ import sys
 try:
     from config.settings import SEC_BASE_URL, SEC_USER_AGENT, MIN_TRANSACTION_VALUE, TRACK_PURCHASES, TRACK_SALES, TRACK_AWARDS
     from config.tickers import COMPANY_ALIASES
+    from utils.cache import DiskCache
+    from utils.rate_limiter import AsyncRateLimiter
+    from utils.helpers import strip_company_suffixes
 except ImportError:
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from config.settings import SEC_BASE_URL, SEC_USER_AGENT, MIN_TRANSACTION_VALUE, TRACK_PURCHASES, TRACK_SALES, TRACK_AWARDS
     from config.tickers import COMPANY_ALIASES
+    from utils.cache import DiskCache
+    from utils.rate_limiter import AsyncRateLimiter
+    from utils.helpers import strip_company_suffixes
+
+# aiolimiter is optional; without it the sliding-window AsyncRateLimiter is used
+try:
+    from aiolimiter import AsyncLimiter
+    AIOLIMITER_AVAILABLE = True
+except ImportError:
+    AIOLIMITER_AVAILABLE = False
+    AsyncLimiter = None
+
+# Accession number in filing URLs, optionally preceded by a CIK directory
+_ACCESSION_RE = re.compile(r'/(?:(\d+)/)?(\d{10}-\d{2}-\d{6})')
+
+# Precompiled XPath queries - local-name() matches with or without a namespace
+_XP_HREFS = etree.XPath('//a/@href')
+_XP_NAMED = etree.XPath('.//*[local-name()=$name]')
+_XP_VALUE_TEXT = etree.XPath('.//*[local-name()="value"]/text()')
+_XP_ISSUER = etree.XPath('//*[local-name()="issuer"]')
+_XP_OWNER = etree.XPath('//*[local-name()="reportingOwner"]')
+_XP_RELATIONSHIP = etree.XPath('.//*[local-name()="reportingOwnerRelationship"]')
+_XP_NONDERIV = etree.XPath('//*[local-name()="nonDerivativeTransaction"]')
+_XP_PERIOD = etree.XPath('//*[local-name()="periodOfReport"]/text()')
+_XP_ALL_CODES = etree.XPath('//*[local-name()="nonDerivativeTransaction"]//*[local-name()="transactionCoding"]//*[local-name()="transactionCode"]/text()')
+_XP_CODE = etree.XPath('.//*[local-name()="transactionCoding"]//*[local-name()="transactionCode"]/text()')
+_XP_SHARES = etree.XPath('.//*[local-name()="transactionAmounts"]//*[local-name()="transactionShares"]//*[local-name()="value"]/text()')
+_XP_PRICE = etree.XPath('.//*[local-name()="transactionAmounts"]//*[local-name()="transactionPricePerShare"]//*[local-name()="value"]/text()')
+_XP_DATE = etree.XPath('.//*[local-name()="transactionDate"]//*[local-name()="value"]/text()')
+_XP_SHARES_AFTER = etree.XPath('.//*[local-name()="postTransactionAmounts"]//*[local-name()="sharesOwnedFollowingTransaction"]//*[local-name()="value"]/text()')
+
+# Transaction codes to aggregate, resolved from settings once at import
+# P = Purchase, S = Sale, A = Award/Grant, M = Exercise
+_TRACKED_CODES = frozenset(
+    code for code, tracked in (
+        ('P', TRACK_PURCHASES),
+        ('S', TRACK_SALES),
+        ('A', TRACK_AWARDS),
+        ('M', True),
+    ) if tracked
+)
+
+# COMPANY_ALIASES with suffixes stripped once at import
+_STRIPPED_ALIASES = {strip_company_suffixes(alias): ticker for alias, ticker in COMPANY_ALIASES.items()}
+
+# Matches any stripped alias inside a name in one scan; longest aliases first
+_ALIAS_RE = re.compile('|'.join(
+    re.escape(alias) for alias in sorted(_STRIPPED_ALIASES, key=len, reverse=True) if alias
+))
+
+
+@lru_cache(maxsize=1024)
+def _determine_role_cached(title: Optional[str], is_director: bool, is_officer: bool, is_ten_percent: bool) -> str:
+    """Map an insider's title and flags to a display role. Cached since titles repeat across filings."""
+    if title:
+        title_upper = title.upper()
+        if 'CEO' in title_upper or 'CHIEF EXECUTIVE' in title_upper:
+            return 'CEO'
+        elif 'CFO' in title_upper or 'CHIEF FINANCIAL' in title_upper:
+            return 'CFO'
+        elif 'COO' in title_upper or 'CHIEF OPERATING' in title_upper:
+            return 'COO'
+        elif 'CTO' in title_upper or 'CHIEF TECHNOLOGY' in title_upper:
+            return 'CTO'
+        elif 'PRESIDENT' in title_upper:
+            return 'President'
+        elif 'VP' in title_upper or 'VICE PRESIDENT' in title_upper:
+            return 'VP'
+        elif 'DIRECTOR' in title_upper:
+            return 'Director'
+        elif 'GENERAL COUNSEL' in title_upper:
+            return 'General Counsel'
+        elif 'SECRETARY' in title_upper:
+            return 'Secretary'
+        else:
+            # Return shortened title
+            return title[:25] + '...' if len(title) > 25 else title
+
+    if is_officer:
+        return 'Officer'
+    if is_director:
+        return 'Director'
+    if is_ten_percent:
+        return '10% Owner'
+
+    return 'Insider'
+
+
+# SEC asks for max 10 requests/second
+SEC_MAX_REQUESTS_PER_SECOND = 10
+
+# Retries for transient SEC errors: 0.5s, 1s, 2s... capped at 4s between attempts
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 4.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Parsed filings are kept well past the feed's window, then expire
+FILING_CACHE_SECONDS = 7 * 24 * 3600
+
+# Issuer CIK -> ticker entries remembered from earlier filings
+ISSUER_CACHE_SIZE = 10_000
 
 
 class SECForm4Scraper:
     """Scraper for SEC Form 4 filings."""
 
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             'User-Agent': SEC_USER_AGENT,
             'Accept-Encoding': 'gzip, deflate',
             'Accept': 'application/atom+xml, application/xml, text/xml, */*',
-        })
+        }
         self.base_url = "https://www.sec.gov"
         self.rss_url = "https://www.sec.gov/cgi-bin/browse-edgar?action=getcurrent&type=4&company=&dateb=&owner=only&count=100&output=atom"
+        self.cache = DiskCache('form4')
+        self._issuer_tickers = {}
 
     def scrape_recent_filings(self, max_filings: int = 100) -> List[Dict]:
         """
         Scrape recent Form 4 filings from SEC RSS feed.
         Returns list of parsed trade dictionaries.
         """
+        # A private loop that never becomes the thread's current loop, unlike
+        # asyncio.run(), so the browser bot's loop is left untouched
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.scrape_recent_filings_async(max_filings))
+        finally:
+            loop.close()
+
+    async def scrape_recent_filings_async(self, max_filings: int = 100) -> List[Dict]:
+        """
+        Scrape recent Form 4 filings concurrently.
+        Filings are fetched in parallel, capped at SEC's 10 requests/second.
+        """
         print(f"Scraping up to {max_filings} recent Form 4 filings...")
 
-        try:
-            # Get RSS feed
-            response = self.session.get(self.rss_url, timeout=30)
-            response.raise_for_status()
+        # Created per run so they bind to the running event loop
+        self._semaphore = asyncio.Semaphore(SEC_MAX_REQUESTS_PER_SECOND)
+        if AIOLIMITER_AVAILABLE:
+            self._limiter = AsyncLimiter(SEC_MAX_REQUESTS_PER_SECOND, 1.0)
+        else:
+            self._limiter = AsyncRateLimiter(SEC_MAX_REQUESTS_PER_SECOND, 1)
 
-            # Parse RSS
-            root = ET.fromstring(response.content)
+        connector = aiohttp.TCPConnector(limit_per_host=SEC_MAX_REQUESTS_PER_SECOND)
+        timeout = aiohttp.ClientTimeout(total=30)
 
-            # Handle namespace
-            ns = {'atom': 'http://www.w3.org/2005/Atom'}
-            entries = root.findall('.//atom:entry', ns)
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=timeout) as session:
+            try:
+                # Get RSS feed
+                root = await self._fetch_xml(session, self.rss_url)
 
-            print(f"Found {len(entries)} entries in RSS feed")
+                # Handle namespace
+                ns = {'atom': 'http://www.w3.org/2005/Atom'}
+                entries = root.findall('.//atom:entry', ns)
 
-            trades = []
-            for i, entry in enumerate(entries[:max_filings]):
-                try:
-                    # Extract basic info from RSS
-                    title_elem = entry.find('atom:title', ns)
-                    link_elem = entry.find('atom:link', ns)
-                    updated_elem = entry.find('atom:updated', ns)
+                print(f"Found {len(entries)} entries in RSS feed")
 
-                    if title_elem is None or link_elem is None:
-                        continue
+            except Exception as e:
+                print(f"Error scraping SEC RSS: {e}")
+                return []
+
+            # Default filing date for the whole batch
+            batch_date = datetime.now().strftime('%Y-%m-%d')
 
-                    title = title_elem.text
-                    link = link_elem.get('href')
-                    updated = updated_elem.text if updated_elem is not None else None
+            filings = []
+            seen = set()
+            for entry in entries[:max_filings]:
+                # Extract basic info from RSS
+                title_elem = entry.find('atom:title', ns)
+                link_elem = entry.find('atom:link', ns)
+                updated_elem = entry.find('atom:updated', ns)
+
+                if title_elem is None or link_elem is None:
+                    continue
 
-                    # Parse the filing detail page
-                    trade = self._parse_filing(link, title, updated)
-                    if trade and trade.get('total_value', 0) >= MIN_TRANSACTION_VALUE:
-                        trades.append(trade)
-                        print(f"  [{i+1}] ${trade.get('ticker', 'N/A')}: {trade.get('insider_role')} - ${trade.get('total_value', 0):,.0f}")
+                title = title_elem.text or ''
+                link = link_elem.get('href')
 
-                    # Rate limit: SEC asks for max 10 requests/second
-                    time.sleep(0.15)
+                # The feed lists a filing once per party (issuer and reporting
+                # owner), under each party's CIK, so dedupe on the accession number
+                key = self._filing_cache_key(link) or link
+                if key in seen:
+                    continue
+                seen.add(key)
 
-                except Exception as e:
-                    print(f"Error parsing filing {i+1}: {e}")
+                # Amendments restate filings that were already reported
+                if title.startswith('4/A'):
                     continue
 
-            print(f"\nSuccessfully parsed {len(trades)} trades above ${MIN_TRANSACTION_VALUE:,}")
-            return trades
+                updated = updated_elem.text if updated_elem is not None else None
+                filings.append((link, title, updated))
+
+            # Filings seen on an earlier run come straight from the disk cache
+            cached = [self._get_cached_filing(link) for link, _, _ in filings]
+
+            # Parse the remaining filing detail pages concurrently
+            parsed = iter(await asyncio.gather(
+                *[self._parse_filing(session, link, title, updated, batch_date)
+                  for (link, title, updated), hit in zip(filings, cached) if hit is None],
+                return_exceptions=True,
+            ))
+            results = [hit if hit is not None else next(parsed) for hit in cached]
+
+        trades = []
+        for i, trade in enumerate(results):
+            if isinstance(trade, Exception):
+                print(f"Error parsing filing {i+1}: {trade}")
+                continue
+            if trade and trade.get('total_value', 0) >= MIN_TRANSACTION_VALUE:
+                trades.append(trade)
+                print(f"  [{i+1}] ${trade.get('ticker', 'N/A')}: {trade.get('insider_role')} - ${trade.get('total_value', 0):,.0f}")
+
+        print(f"\nSuccessfully parsed {len(trades)} trades above ${MIN_TRANSACTION_VALUE:,}")
+        return trades
+
+    def _filing_cache_key(self, filing_url: str) -> Optional[str]:
+        """Disk cache key for a filing, or None if the URL has no accession number."""
+        match = _ACCESSION_RE.search(filing_url)
+        return f"filing:{match.group(2)}" if match else None
+
+    def _get_cached_filing(self, filing_url: str) -> Optional[Dict]:
+        """
+        Get a previously parsed filing.
+        Returns the trade dict, {} for a filing that had no trade, or None if unseen.
+        """
+        key = self._filing_cache_key(filing_url)
+        return self.cache.get(key) if key else None
 
-        except Exception as e:
-            print(f"Error scraping SEC RSS: {e}")
-            return []
+    async def _throttle(self):
+        """Wait for a slot under SEC's rate limit (short bursts, 10/second overall)."""
+        await self._limiter.acquire()
 
-    def _parse_filing(self, filing_url: str, title: str, updated: str) -> Optional[Dict]:
+    async def _request(self, session: aiohttp.ClientSession, url: str, read):
+        """
+        GET a URL, respecting the SEC rate limit, and return read(response).
+        Rate limiting, server errors and dropped connections are retried with
+        exponential backoff; other HTTP errors (e.g. 404) are raised immediately.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                async with self._semaphore:
+                    await self._throttle()
+                    async with session.get(url) as response:
+                        response.raise_for_status()
+                        return await read(response)
+            except aiohttp.ClientResponseError as e:
+                if e.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    raise
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == MAX_RETRIES:
+                    raise
+
+            await asyncio.sleep(min(RETRY_BASE_DELAY * 2 ** attempt, RETRY_MAX_DELAY))
+
+    async def _fetch(self, session: aiohttp.ClientSession, url: str) -> bytes:
+        """GET a URL's body."""
+        return await self._request(session, url, lambda response: response.read())
+
+    async def _fetch_xml(self, session: aiohttp.ClientSession, url: str):
+        """GET an XML document, feeding it to the parser as it downloads."""
+        async def read(response):
+            # Fresh parser per attempt so a retry never sees a partial document
+            parser = etree.XMLParser(resolve_entities=False)
+            # aiohttp has already undone any gzip/deflate encoding here
+            async for chunk in response.content.iter_chunked(8192):
+                parser.feed(chunk)
+            return parser.close()
+
+        return await self._request(session, url, read)
+
+    async def _parse_filing(self, session: aiohttp.ClientSession, filing_url: str,
+                            title: str, updated: str, batch_date: str) -> Optional[Dict]:
         """Parse a single Form 4 filing page to extract trade details."""
         try:
-            # Get the filing index page
-            response = self.session.get(filing_url, timeout=30)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'lxml')
-
-            # Find the XML file link (contains structured data)
-            xml_link = None
-            xml_candidates = []
-
-            # Look for XML links in the document table
-            table = soup.find('table', class_='tableFile')
-            if table:
-                for row in table.find_all('tr'):
-                    cells = row.find_all('td')
-                    if len(cells) >= 3:
-                        link = cells[2].find('a')
-                        if link:
-                            href = link.get('href', '')
-                            # Skip XSL-transformed files and primary_doc
-                            if href.endswith('.xml'):
-                                if 'xsl' not in href.lower() and 'primary_doc' not in href.lower():
-                                    xml_candidates.append(href)
-
-            # Also look for links outside the table
-            for link in soup.find_all('a'):
-                href = link.get('href', '')
-                if href.endswith('.xml') and 'xsl' not in href.lower() and 'primary_doc' not in href.lower():
-                    if href not in xml_candidates:
-                        xml_candidates.append(href)
-
-            # Try each candidate XML file
-            for href in xml_candidates:
-                xml_link = self.base_url + href if href.startswith('/') else href
-                result = self._parse_form4_xml(xml_link, filing_url)
-                if result:
-                    return result
-
+            # Prefer the directory's JSON listing, fall back to the HTML index page
+            xml_links = await self._get_filing_documents(session, filing_url)
+            if xml_links is None:
+                xml_links = await self._parse_filing_index(session, filing_url)
+
+            # Try the candidate XML files concurrently - first successful parse wins
+            failed = False
+            tasks = []
+            for xml_link in xml_links:
+                tasks.append(asyncio.create_task(self._parse_form4_xml(session, xml_link, filing_url, batch_date)))
+
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    try:
+                        result = await next_done
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        print(f"Error fetching XML for {filing_url}: {e}")
+                        failed = True
+                        continue
+                    if result:
+                        self._cache_filing(filing_url, result)
+                        return result
+            finally:
+                # Stop probing the remaining candidates
+                for task in tasks:
+                    task.cancel()
+
+            # Remember filings without a trade too, unless a fetch failed and should be retried
+            if not failed:
+                self._cache_filing(filing_url, {})
             return None
 
         except Exception as e:
             print(f"Error parsing filing {filing_url}: {e}")
             return None
 
-    def _parse_form4_xml(self, xml_url: str, filing_url: str) -> Optional[Dict]:
+    async def _get_filing_documents(self, session: aiohttp.ClientSession,
+                                    filing_url: str) -> Optional[List[str]]:
+        """
+        List the filing's XML documents via the directory's index.json.
+        Returns XML URLs, or None to fall back to the HTML index.
+        """
+        if '-index.htm' not in filing_url:
+            return None
+
+        directory = filing_url.rsplit('/', 1)[0]
+        try:
+            data = json.loads(await self._fetch(session, f"{directory}/index.json"))
+            items = data.get('directory', {}).get('item', [])
+        except (aiohttp.ClientResponseError, ValueError, AttributeError):
+            return None
+
+        xml_links = []
+        for item in items:
+            # Skip XSL-transformed files and primary_doc
+            name = item.get('name', '')
+            name_lower = name.lower()
+            if name.endswith('.xml') and 'xsl' not in name_lower and 'primary_doc' not in name_lower:
+                xml_links.append(f"{directory}/{name}")
+
+        return xml_links
+
+    async def _parse_filing_index(self, session: aiohttp.ClientSession, filing_url: str) -> List[str]:
+        """List the filing's XML documents by scraping the HTML index page."""
+        content = await self._fetch(session, filing_url)
+        doc = lxml.html.fromstring(content)
+
+        # Find the XML file links (contain structured data)
+        xml_links = []
+        for href in _XP_HREFS(doc):
+            # Skip XSL-transformed files and primary_doc
+            href_lower = href.lower()
+            if href.endswith('.xml') and 'xsl' not in href_lower and 'primary_doc' not in href_lower:
+                xml_link = self.base_url + href if href.startswith('/') else href
+                if xml_link not in xml_links:
+                    xml_links.append(xml_link)
+
+        return xml_links
+
+    def _cache_filing(self, filing_url: str, trade: Dict):
+        """Store a parsed filing ({} if it had no trade) so later runs skip it."""
+        key = self._filing_cache_key(filing_url)
+        if key:
+            self.cache.set(key, trade, expire=FILING_CACHE_SECONDS)
+
+    async def _parse_form4_xml(self, session: aiohttp.ClientSession, xml_url: str,
+                               filing_url: str, batch_date: str) -> Optional[Dict]:
         """Parse Form 4 XML to extract trade details."""
         try:
-            response = self.session.get(xml_url, timeout=30)
-            response.raise_for_status()
-
-            # Parse XML, handling potential encoding issues
-            content = response.content
-            root = ET.fromstring(content)
-
-            # Extract issuer (company) info - try various element paths
-            issuer = root.find('.//issuer')
-            if issuer is None:
-                issuer = root.find('.//{*}issuer')
-            if issuer is None:
-                # Try finding by tag name directly
-                for elem in root.iter():
-                    if 'issuer' in elem.tag.lower():
-                        issuer = elem
-                        break
-
-            if issuer is None:
+            root = await self._fetch_xml(session, xml_url)
+
+            # Grants, gifts, tax withholding etc. only - nothing to aggregate
+            if not any(code.strip() in _TRACKED_CODES for code in _XP_ALL_CODES(root)):
+                return None
+
+            # Extract issuer (company) info
+            issuers = _XP_ISSUER(root)
+            if not issuers:
                 return None
+            issuer = issuers[0]
 
             company_cik = self._get_text_from_element(issuer, ['issuerCik', 'cik'])
             company_name = self._get_text_from_element(issuer, ['issuerName', 'name'])
@@ -172,24 +413,24 @@ class SECForm4Scraper:
             # Clean up ticker
             if ticker:
                 ticker = ticker.upper().strip()
+                if company_cik:
+                    self._remember_issuer(company_cik, ticker)
             else:
-                # Try to match from company name
-                ticker = self._match_ticker(company_name)
+                # Reuse the ticker from an earlier filing, else match from company name
+                ticker = self._issuer_tickers.get(company_cik) or self._match_ticker(company_name)
 
             # Extract reporting owner (insider) info
-            owner = root.find('.//reportingOwner')
-            if owner is None:
-                owner = root.find('.//{*}reportingOwner')
-            if owner is None:
+            owners = _XP_OWNER(root)
+            if not owners:
                 return None
+            owner = owners[0]
 
             insider_cik = self._get_text_from_element(owner, ['rptOwnerCik', 'cik'])
             insider_name = self._get_text_from_element(owner, ['rptOwnerName', 'name']) or "Unknown"
 
             # Get relationship
-            relationship = owner.find('.//reportingOwnerRelationship')
-            if relationship is None:
-                relationship = owner.find('.//{*}reportingOwnerRelationship')
+            relationships = _XP_RELATIONSHIP(owner)
+            relationship = relationships[0] if relationships else None
 
             is_director = False
             is_officer = False
@@ -207,10 +448,7 @@ class SECForm4Scraper:
 
             # Extract transaction details
             # Look for non-derivative transactions (regular stock)
-            transactions = root.findall('.//nonDerivativeTransaction')
-            if not transactions:
-                transactions = root.findall('.//{*}nonDerivativeTransaction')
-
+            transactions = _XP_NONDERIV(root)
             if not transactions:
                 return None
 
@@ -224,89 +462,41 @@ class SECForm4Scraper:
 
             for trans in transactions:
                 # Transaction coding
-                trans_coding = trans.find('.//transactionCoding')
-                if trans_coding is None:
-                    trans_coding = trans.find('.//{*}transactionCoding')
-
-                if trans_coding is not None:
-                    code = self._get_text_from_element(trans_coding, ['transactionCode'])
-                    if code:
-                        transaction_type = code
-
-                # Filter based on transaction type and settings
-                # P = Purchase, S = Sale, A = Award/Grant, M = Exercise
-                if transaction_type == 'P' and not TRACK_PURCHASES:
-                    continue
-                if transaction_type == 'S' and not TRACK_SALES:
-                    continue
-                if transaction_type == 'A' and not TRACK_AWARDS:
-                    continue
-                # Skip unknown transaction types
-                if transaction_type not in ('P', 'S', 'A', 'M'):
+                codes = _XP_CODE(trans)
+                if codes and codes[0].strip():
+                    transaction_type = codes[0].strip()
+
+                # Skip untracked and unknown transaction types
+                if transaction_type not in _TRACKED_CODES:
                     continue
 
                 # Transaction amounts
-                amounts = trans.find('.//transactionAmounts')
-                if amounts is None:
-                    amounts = trans.find('.//{*}transactionAmounts')
-
-                if amounts is not None:
-                    # Get shares
-                    shares_elem = amounts.find('.//transactionShares')
-                    if shares_elem is None:
-                        shares_elem = amounts.find('.//{*}transactionShares')
-                    if shares_elem is not None:
-                        shares_value = shares_elem.find('.//value')
-                        if shares_value is None:
-                            shares_value = shares_elem.find('.//{*}value')
-                        if shares_value is not None and shares_value.text:
-                            try:
-                                total_shares += float(shares_value.text)
-                            except ValueError:
-                                pass
-
-                    # Get price
-                    price_elem = amounts.find('.//transactionPricePerShare')
-                    if price_elem is None:
-                        price_elem = amounts.find('.//{*}transactionPricePerShare')
-                    if price_elem is not None:
-                        price_value = price_elem.find('.//value')
-                        if price_value is None:
-                            price_value = price_elem.find('.//{*}value')
-                        if price_value is not None and price_value.text:
-                            try:
-                                price_per_share = float(price_value.text)
-                            except ValueError:
-                                pass
+                shares_values = _XP_SHARES(trans)
+                if shares_values:
+                    try:
+                        total_shares += float(shares_values[0])
+                    except ValueError:
+                        pass
+
+                price_values = _XP_PRICE(trans)
+                if price_values:
+                    try:
+                        price_per_share = float(price_values[0])
+                    except ValueError:
+                        pass
 
                 # Transaction date
-                trans_date = trans.find('.//transactionDate')
-                if trans_date is None:
-                    trans_date = trans.find('.//{*}transactionDate')
-                if trans_date is not None:
-                    date_value = trans_date.find('.//value')
-                    if date_value is None:
-                        date_value = trans_date.find('.//{*}value')
-                    if date_value is not None and date_value.text:
-                        transaction_date = date_value.text
+                date_values = _XP_DATE(trans)
+                if date_values and date_values[0].strip():
+                    transaction_date = date_values[0]
 
                 # Post-transaction holdings
-                post_holdings = trans.find('.//postTransactionAmounts')
-                if post_holdings is None:
-                    post_holdings = trans.find('.//{*}postTransactionAmounts')
-                if post_holdings is not None:
-                    shares_after_elem = post_holdings.find('.//sharesOwnedFollowingTransaction')
-                    if shares_after_elem is None:
-                        shares_after_elem = post_holdings.find('.//{*}sharesOwnedFollowingTransaction')
-                    if shares_after_elem is not None:
-                        value_elem = shares_after_elem.find('.//value')
-                        if value_elem is None:
-                            value_elem = shares_after_elem.find('.//{*}value')
-                        if value_elem is not None and value_elem.text:
-                            try:
-                                shares_after = int(float(value_elem.text))
-                            except ValueError:
-                                pass
+                after_values = _XP_SHARES_AFTER(trans)
+                if after_values:
+                    try:
+                        shares_after = int(float(after_values[0]))
+                    except ValueError:
+                        pass
 
             # Calculate total value
             if total_shares and price_per_share:
@@ -317,26 +507,18 @@ class SECForm4Scraper:
                 return None
 
             # Extract accession number from URL
-            accession_match = re.search(r'/(\d{10}-\d{2}-\d{6})', filing_url)
-            accession_number = accession_match.group(1) if accession_match else None
-
-            if not accession_number:
-                # Try alternate format
-                accession_match = re.search(r'/(\d+)/(\d{10}-\d{2}-\d{6})', filing_url)
-                if accession_match:
-                    accession_number = accession_match.group(2)
-
-            if not accession_number:
+            accession_match = _ACCESSION_RE.search(filing_url)
+            if accession_match:
+                accession_number = accession_match.group(2)
+            else:
                 # Generate a unique ID from URL
                 accession_number = filing_url.split('/')[-2] if '/' in filing_url else str(hash(filing_url))
 
             # Get filing date
-            filing_date = datetime.now().strftime('%Y-%m-%d')  # Default to today
-            period_report = root.find('.//periodOfReport')
-            if period_report is None:
-                period_report = root.find('.//{*}periodOfReport')
-            if period_report is not None and period_report.text:
-                filing_date = period_report.text
+            filing_date = batch_date  # Default to today
+            periods = _XP_PERIOD(root)
+            if periods and periods[0]:
+                filing_date = periods[0]
 
             return {
                 'accession_number': accession_number,
@@ -360,101 +542,70 @@ class SECForm4Scraper:
                 'shares_owned_after': shares_after,
             }
 
-        except ET.ParseError as e:
+        except etree.XMLSyntaxError as e:
             print(f"XML Parse Error for {xml_url}: {e}")
             return None
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            # Network errors are handled by the caller so the filing isn't cached
+            raise
         except Exception as e:
             print(f"Error parsing XML {xml_url}: {e}")
             return None
 
+    def _remember_issuer(self, company_cik: str, ticker: str):
+        """Record an issuer's ticker, evicting the oldest entry when full."""
+        if company_cik not in self._issuer_tickers and len(self._issuer_tickers) >= ISSUER_CACHE_SIZE:
+            del self._issuer_tickers[next(iter(self._issuer_tickers))]
+        self._issuer_tickers[company_cik] = ticker
+
     def _get_text_from_element(self, element, tag_names: List[str]) -> Optional[str]:
         """Try to get text from element using multiple possible tag names."""
         if element is None:
             return None
 
         for tag in tag_names:
-            # Try direct child
-            child = element.find(f'.//{tag}')
-            if child is None:
-                # Try with wildcard namespace
-                child = element.find('.//{*}' + tag)
-            if child is None:
-                # Try case-insensitive search
-                for elem in element.iter():
-                    if tag.lower() in elem.tag.lower():
-                        if elem.text:
-                            return elem.text.strip()
-                        # Check for value sub-element
-                        value = elem.find('.//value')
-                        if value is not None and value.text:
-                            return value.text.strip()
-
-            if child is not None:
-                if child.text:
-                    return child.text.strip()
-                # Check for value sub-element
-                value = child.find('.//value')
-                if value is None:
-                    value = child.find('.//{*}value')
-                if value is not None and value.text:
-                    return value.text.strip()
+            # One bounded XPath lookup - local-name() ignores any namespace
+            matches = _XP_NAMED(element, name=tag)
+            if not matches:
+                continue
+
+            child = matches[0]
+            text = (child.text or '').strip()
+            if text:
+                return text
+
+            # Check for value sub-element
+            values = _XP_VALUE_TEXT(child)
+            if values and values[0].strip():
+                return values[0].strip()
 
         return None
 
     def _determine_role(self, is_director: bool, is_officer: bool, is_ten_percent: bool, title: str) -> str:
         """Determine the insider's role for display."""
-        if title:
-            title_upper = title.upper()
-            if 'CEO' in title_upper or 'CHIEF EXECUTIVE' in title_upper:
-                return 'CEO'
-            elif 'CFO' in title_upper or 'CHIEF FINANCIAL' in title_upper:
-                return 'CFO'
-            elif 'COO' in title_upper or 'CHIEF OPERATING' in title_upper:
-                return 'COO'
-            elif 'CTO' in title_upper or 'CHIEF TECHNOLOGY' in title_upper:
-                return 'CTO'
-            elif 'PRESIDENT' in title_upper:
-                return 'President'
-            elif 'VP' in title_upper or 'VICE PRESIDENT' in title_upper:
-                return 'VP'
-            elif 'DIRECTOR' in title_upper:
-                return 'Director'
-            elif 'GENERAL COUNSEL' in title_upper:
-                return 'General Counsel'
-            elif 'SECRETARY' in title_upper:
-                return 'Secretary'
-            else:
-                # Return shortened title
-                return title[:25] + '...' if len(title) > 25 else title
-
-        if is_officer:
-            return 'Officer'
-        if is_director:
-            return 'Director'
-        if is_ten_percent:
-            return '10% Owner'
-
-        return 'Insider'
+        return _determine_role_cached(title, is_director, is_officer, is_ten_percent)
 
     def _match_ticker(self, company_name: str) -> Optional[str]:
         """Try to match company name to ticker symbol."""
         if not company_name:
             return None
 
-        name_upper = company_name.upper().strip()
-
-        # Remove common suffixes for matching
-        for suffix in [', INC.', ', INC', ' INC.', ' INC', ' CORP.', ' CORP', ' LLC', ' LTD', ' CO.', ' CO']:
-            name_upper = name_upper.replace(suffix, '')
+        name_upper = strip_company_suffixes(company_name.upper())
+        if not name_upper:
+            return None
 
         # Direct match
-        if name_upper in COMPANY_ALIASES:
-            return COMPANY_ALIASES[name_upper]
+        if name_upper in _STRIPPED_ALIASES:
+            return _STRIPPED_ALIASES[name_upper]
+
+        # Partial match: an alias inside the name
+        match = _ALIAS_RE.search(name_upper)
+        if match:
+            return _STRIPPED_ALIASES[match.group()]
 
-        # Partial match
-        for alias, ticker in COMPANY_ALIASES.items():
-            clean_alias = alias.replace(', INC.', '').replace(', INC', '').replace(' INC.', '').replace(' INC', '')
-            if clean_alias in name_upper or name_upper in clean_alias:
+        # Partial match: the name inside an alias (e.g. "META" -> "META PLATFORMS")
+        for alias, ticker in _STRIPPED_ALIASES.items():
+            if name_upper in alias:
                 return ticker
 
         return None
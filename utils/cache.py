@@ -0,0 +1,166 @@
+"""
+Persistent on-disk cache for scraped SEC data.
+"""
+
+import os
+import pickle
+import sqlite3
+import time
+from typing import Any, Optional
+
+import requests
+
+# Import settings - handle both module import and direct execution
+try:
+    from config.settings import CACHE_DIR
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from config.settings import CACHE_DIR
+
+# requests-cache is optional; without it SEC requests always hit the network
+try:
+    from requests_cache import CachedSession, EXPIRE_IMMEDIATELY
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
+
+def get_cache_dir() -> str:
+    """Get the cache directory, creating it if needed."""
+    cache_dir = CACHE_DIR
+    if not os.path.isabs(cache_dir):
+        # Make path relative to project root
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        cache_dir = os.path.join(project_root, cache_dir)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def create_sec_session(name: str = 'sec_http') -> requests.Session:
+    """
+    Create an HTTP session for SEC EDGAR.
+    With requests-cache installed, GET responses are cached on disk and
+    revalidated with ETag/Last-Modified, so unchanged pages come back as 304s.
+    """
+    if not REQUESTS_CACHE_AVAILABLE:
+        return requests.Session()
+
+    session = CachedSession(
+        os.path.join(get_cache_dir(), name),
+        backend='sqlite',
+        expire_after=3600,
+        urls_expire_after={
+            # Filing documents never change, but parsed filings are cached
+            # by accession number, so the raw pages only need to live briefly
+            'www.sec.gov/Archives/': 24 * 3600,
+            # Feeds change constantly, so always revalidate
+            'www.sec.gov/cgi-bin/browse-edgar': EXPIRE_IMMEDIATELY,
+        },
+        cache_control=True,
+        stale_if_error=True,
+        allowable_methods=('GET',),
+        match_headers=('User-Agent',),
+    )
+
+    # Expired responses stay on disk until deleted, so drop them on startup
+    session.cache.delete(expired=True)
+    return session
+
+
+class DiskCache:
+    """
+    Simple key/value cache backed by a SQLite file.
+    Values are pickled, so any picklable object can be stored.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize disk cache.
+
+        Args:
+            name: Cache name, used as the SQLite file name inside CACHE_DIR
+        """
+        self.path = os.path.join(get_cache_dir(), f"{name}.db")
+
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache (
+                    key TEXT PRIMARY KEY,
+                    value BLOB,
+                    expires_at REAL  -- NULL = never expires
+                )
+            """)
+            # get() only skips expired rows, so drop them here
+            conn.execute(
+                "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at < ?",
+                (time.time(),)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a cached value, or default if missing or expired."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        finally:
+            conn.close()
+
+        if row is None:
+            return default
+
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            return default
+
+        try:
+            return pickle.loads(value)
+        except Exception:
+            return default
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None):
+        """
+        Store a value in the cache.
+
+        Args:
+            key: Cache key
+            value: Any picklable value
+            expire: Seconds until the entry expires (None = never)
+        """
+        expires_at = time.time() + expire if expire is not None else None
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, pickle.dumps(value), expires_at)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def delete(self, key: str):
+        """Remove a key from the cache."""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM cache")
+            conn.commit()
+        finally:
+            conn.close()
@@ -3,9 +3,22 @@ Utility helpers for SmartMoneyAlerts.
 """
 
 import re
+import textwrap
 from datetime import datetime, timedelta
 from typing import Optional
 
+_TICKER_RE = re.compile(r'^[A-Z]{1,5}\.?[A-Z]{0,2}$')
+_NEWLINES_RE = re.compile(r'\n{3,}')
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}:\d{2}Z?)?$')
+
+# Trailing corporate suffixes, possibly stacked ("TESLA INC/DE/", "FOO CORP CLASS A").
+# A suffix after "&" is part of the name ("JPMORGAN CHASE & CO"), so it is kept.
+_COMPANY_SUFFIX_RE = re.compile(
+    r'(?:(?:,\s*|(?<![&\s])\s+)(?:INC|CORP(?:ORATION)?|LLC|LTD|CO)\.?'
+    r'|\s*/DE/?|\s+COMMON\s+STOCK|\s+COM|\s+CLASS\s+[AB])+\s*$',
+    re.IGNORECASE
+)
+
 
 def format_currency(value: float) -> str:
     """Format a dollar value for display."""
@@ -58,28 +71,17 @@ def time_ago(date_str: str, format: str = '%Y-%m-%d') -> str:
         return date_str
 
 
+def strip_company_suffixes(name: str) -> str:
+    """Remove trailing corporate suffixes ("INC", "CORP", "/DE/", "CLASS A", ...) from a company name."""
+    return _COMPANY_SUFFIX_RE.sub('', name).strip()
+
+
 def clean_company_name(name: str) -> str:
     """Clean up company name for display."""
     if not name:
         return "Unknown"
 
-    # Remove common suffixes
-    suffixes = [
-        ', INC.', ', INC', ' INC.', ' INC',
-        ', CORP.', ', CORP', ' CORP.', ' CORP',
-        ' CORPORATION', ', LLC', ' LLC',
-        ', LTD.', ', LTD', ' LTD.',
-        ' CO.', ', CO.', '/DE', '/DE/',
-        ' COMMON STOCK', ' COM', ' CLASS A', ' CLASS B',
-    ]
-
-    name_upper = name.upper()
-    for suffix in suffixes:
-        if name_upper.endswith(suffix.upper()):
-            name = name[:-len(suffix)]
-            name_upper = name.upper()
-
-    return name.strip()
+    return strip_company_suffixes(name) or "Unknown"
 
 
 def clean_insider_name(name: str) -> str:
@@ -120,7 +122,7 @@ def is_valid_ticker(ticker: str) -> bool:
         return False
 
     # Basic validation: 1-5 uppercase letters, possibly with a period
-    return bool(re.match(r'^[A-Z]{1,5}\.?[A-Z]{0,2}$', ticker.upper()))
+    return bool(_TICKER_RE.match(ticker.upper()))
 
 
 def sanitize_for_tweet(text: str) -> str:
@@ -130,7 +132,7 @@ def sanitize_for_tweet(text: str) -> str:
 
     # Remove or replace problematic characters
     text = text.replace('\r', '')
-    text = re.sub(r'\n{3,}', '\n\n', text)  # Max 2 consecutive newlines
+    text = _NEWLINES_RE.sub('\n\n', text)  # Max 2 consecutive newlines
 
     # Ensure no line is too long (Twitter handles this, but for display)
     lines = text.split('\n')
@@ -138,40 +140,37 @@ def sanitize_for_tweet(text: str) -> str:
     for line in lines:
         if len(line) > 100:
             # Break long lines at spaces
-            words = line.split()
-            current_line = ""
-            for word in words:
-                if len(current_line) + len(word) + 1 > 100:
-                    sanitized_lines.append(current_line.strip())
-                    current_line = word
-                else:
-                    current_line += " " + word
-            if current_line:
-                sanitized_lines.append(current_line.strip())
+            sanitized_lines.extend(textwrap.wrap(line, width=100, break_long_words=False,
+                                                 break_on_hyphens=False))
         else:
             sanitized_lines.append(line)
 
     return '\n'.join(sanitized_lines).strip()
 
 
+def _date_format(date_str: str) -> str:
+    """Pick the strptime format for a date string from its shape."""
+    if 'T' in date_str:
+        return '%Y-%m-%dT%H:%M:%SZ' if date_str.endswith('Z') else '%Y-%m-%dT%H:%M:%S'
+
+    year_first = date_str[:4].isdigit()
+    if '/' in date_str:
+        return '%Y/%m/%d' if year_first else '%m/%d/%Y'
+    return '%Y-%m-%d' if year_first else '%d-%m-%Y'
+
+
 def parse_date(date_str: str) -> Optional[datetime]:
     """Parse various date formats."""
-    formats = [
-        '%Y-%m-%d',
-        '%Y/%m/%d',
-        '%m/%d/%Y',
-        '%d-%m-%Y',
-        '%Y-%m-%dT%H:%M:%S',
-        '%Y-%m-%dT%H:%M:%SZ',
-    ]
-
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_str, fmt)
-        except ValueError:
-            continue
+    if not date_str:
+        return None
 
-    return None
+    try:
+        # Common case: zero-padded ISO dates and timestamps
+        if _ISO_DATE_RE.match(date_str):
+            return datetime.fromisoformat(date_str.rstrip('Z'))
+        return datetime.strptime(date_str, _date_format(date_str))
+    except ValueError:
+        return None
 
 
 def get_market_hours_status() -> dict:
@@ -2,19 +2,28 @@
 Rate limiting utilities for API calls.
 """
 
+import asyncio
+import functools
 import time
-from datetime import datetime, timedelta
+from bisect import bisect_left
 from typing import Dict, Optional
 from collections import deque
 import threading
 
+# Waits shorter than this (100 us) are spun through rather than slept on
+SPIN_THRESHOLD_NS = 100_000
+
 
 class RateLimiter:
     """
-    Token bucket rate limiter.
-    Ensures we don't exceed API rate limits.
+    Sliding-window rate limiter.
+    Ensures we don't exceed API rate limits: at most max_requests in any
+    time_window_seconds. Each acquire is O(1) - one comparison against the
+    oldest of the last max_requests timestamps.
     """
 
+    __slots__ = ('max_requests', 'time_window', 'requests', 'cond', '_window_ns', '_generation', '_snapshot')
+
     def __init__(self, max_requests: int, time_window_seconds: int):
         """
         Initialize rate limiter.
@@ -25,8 +34,14 @@ class RateLimiter:
         """
         self.max_requests = max_requests
         self.time_window = time_window_seconds
-        self.requests: deque = deque()
-        self.lock = threading.Lock()
+        self._window_ns = int(time_window_seconds * 1_000_000_000)
+        # time.monotonic_ns() timestamps of the last max_requests requests;
+        # appending to a full deque drops the oldest, so it never needs pruning
+        self.requests: deque = deque(maxlen=max_requests)
+        self.cond = threading.Condition()
+        # Bumped on every change to requests; get_status recopies the window only when it moves
+        self._generation = 0
+        self._snapshot = (0, ())
 
     def acquire(self, block: bool = True, timeout: Optional[float] = None) -> bool:
         """
@@ -39,62 +54,264 @@ class RateLimiter:
         Returns:
             True if permission granted, False if timeout
         """
-        start_time = time.time()
-
-        while True:
-            with self.lock:
-                now = datetime.now()
-                cutoff = now - timedelta(seconds=self.time_window)
-
-                # Remove old requests outside the time window
-                while self.requests and self.requests[0] < cutoff:
-                    self.requests.popleft()
-
-                # Check if we can make a request
-                if len(self.requests) < self.max_requests:
-                    self.requests.append(now)
+        # Bind the hot attributes once; none of them change after __init__
+        requests = self.requests
+        max_requests = self.max_requests
+        window_ns = self._window_ns
+        cond = self.cond
+        monotonic = time.monotonic_ns
+
+        deadline = monotonic() + int(timeout * 1e9) if timeout is not None else None
+
+        with cond:
+            while True:
+                now = monotonic()
+                cutoff = now - window_ns
+
+                # Check if we can make a request - room left, or the oldest is outside the window
+                if len(requests) < max_requests or requests[0] < cutoff:
+                    requests.append(now)
+                    self._generation += 1
+                    # Only wake another waiter if there is still room; otherwise
+                    # it would just take the lock and go straight back to sleep
+                    if len(requests) < max_requests or requests[0] < cutoff:
+                        cond.notify()
                     return True
 
-            if not block:
-                return False
-
-            # Check timeout
-            if timeout is not None:
-                elapsed = time.time() - start_time
-                if elapsed >= timeout:
+                if not block:
                     return False
 
-            # Wait a bit before trying again
-            time.sleep(0.1)
+                # Sleep until the oldest request leaves the window
+                wait_ns = requests[0] + window_ns - now
+
+                # Check timeout
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return False
+                    wait_ns = min(wait_ns, remaining)
+
+                if wait_ns < SPIN_THRESHOLD_NS:
+                    # Cheaper than a timed wait's sleep and wake-up; the lock is
+                    # released so other threads can make progress meanwhile
+                    spin_until = now + wait_ns
+                    cond.release()
+                    try:
+                        while monotonic() < spin_until:
+                            time.sleep(0)
+                    finally:
+                        cond.acquire()
+                    continue
+
+                cond.wait(timeout=max(0, wait_ns) / 1e9)
+
+    def acquire_n(self, k: int, block: bool = True, timeout: Optional[float] = None) -> int:
+        """
+        Acquire permission for a burst of requests, taking the lock once
+        per batch of free slots rather than once per request.
+
+        Args:
+            k: Number of requests
+            block: If True, wait until all k are allowed
+            timeout: Maximum time to wait (None = forever)
+
+        Returns:
+            Number of requests granted - less than k if not blocking or on timeout
+        """
+        requests = self.requests
+        max_requests = self.max_requests
+        window_ns = self._window_ns
+        cond = self.cond
+        monotonic = time.monotonic_ns
+
+        deadline = monotonic() + int(timeout * 1e9) if timeout is not None else None
+        granted = 0
+
+        with cond:
+            while True:
+                now = monotonic()
+                cutoff = now - window_ns
+
+                # Free slots: unused capacity plus requests that left the window
+                expired = 0
+                for t in requests:
+                    if t >= cutoff:
+                        break
+                    expired += 1
+
+                # Appending to the full deque drops the expired entries
+                take = min(k - granted, max_requests - len(requests) + expired)
+                requests.extend([now] * take)
+                granted += take
+                if take:
+                    self._generation += 1
+
+                if granted == k or not block:
+                    if len(requests) < max_requests or requests[0] < cutoff:
+                        cond.notify()
+                    return granted
+
+                # Window is full - sleep until the oldest request leaves it
+                wait_ns = requests[0] + window_ns - now
+
+                # Check timeout
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return granted
+                    wait_ns = min(wait_ns, remaining)
+
+                cond.wait(timeout=max(0, wait_ns) / 1e9)
 
     def wait(self):
         """Wait until rate limit allows a request."""
-        self.acquire(block=True)
+        self.acquire()
+
+    def get_status(self) -> Dict:
+        """
+        Get current usage of the window.
+        Works from a copy of the timestamps that is only refreshed (under the
+        lock) after an acquire or reset, so repeated status checks don't
+        contend with API calls.
+        """
+        generation, timestamps = self._snapshot
+        if generation != self._generation:
+            with self.cond:
+                timestamps = tuple(self.requests)
+                self._snapshot = (self._generation, timestamps)
+
+        # Timestamps are in order, so the expired ones are a prefix
+        now = time.monotonic_ns()
+        current_requests = len(timestamps) - bisect_left(timestamps, now - self._window_ns)
+
+        # Calculate wait time
+        wait_time = 0.0
+        if current_requests >= self.max_requests:
+            wait_time = max(0, timestamps[0] + self._window_ns - now) / 1e9
+
+        return {
+            'max_requests': self.max_requests,
+            'time_window': self.time_window,
+            'current_requests': current_requests,
+            'wait_time': wait_time,
+        }
 
     def get_wait_time(self) -> float:
-        """Get estimated wait time until next request is allowed."""
-        with self.lock:
-            now = datetime.now()
-            cutoff = now - timedelta(seconds=self.time_window)
+        """
+        Get estimated wait time until next request is allowed.
+        Reads the window without taking the lock, so with acquires running
+        concurrently the estimate may be momentarily stale.
+        """
+        requests = self.requests
+        if len(requests) < self.max_requests:
+            return 0.0
 
-            # Remove old requests
-            while self.requests and self.requests[0] < cutoff:
-                self.requests.popleft()
+        try:
+            oldest = requests[0]
+        except IndexError:
+            # Cleared by reset() in between
+            return 0.0
 
-            if len(self.requests) < self.max_requests:
-                return 0.0
+        return max(0, oldest + self._window_ns - time.monotonic_ns()) / 1e9
 
-            # Calculate wait time
-            oldest = self.requests[0]
-            wait_until = oldest + timedelta(seconds=self.time_window)
-            wait_seconds = (wait_until - now).total_seconds()
+    def reset(self):
+        """Reset the rate limiter."""
+        with self.cond:
+            self.requests.clear()
+            self._generation += 1
+            self.cond.notify_all()
 
-            return max(0.0, wait_seconds)
 
-    def reset(self):
+class AsyncRateLimiter:
+    """
+    asyncio version of RateLimiter for code running on an event loop.
+    Waiting suspends the coroutine instead of blocking the loop's thread.
+    Like other asyncio primitives, an instance belongs to one event loop.
+    """
+
+    __slots__ = ('max_requests', 'time_window', 'requests', 'cond', '_window_ns')
+
+    def __init__(self, max_requests: int, time_window_seconds: int):
+        """
+        Initialize rate limiter.
+
+        Args:
+            max_requests: Maximum number of requests allowed
+            time_window_seconds: Time window in seconds
+        """
+        self.max_requests = max_requests
+        self.time_window = time_window_seconds
+        self._window_ns = int(time_window_seconds * 1_000_000_000)
+        # time.monotonic_ns() timestamps of the last max_requests requests
+        self.requests: deque = deque(maxlen=max_requests)
+        self.cond = asyncio.Condition()
+
+    async def acquire(self, block: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Acquire permission to make a request.
+
+        Args:
+            block: If True, wait until rate limit allows
+            timeout: Maximum time to wait (None = forever)
+
+        Returns:
+            True if permission granted, False if timeout
+        """
+        requests = self.requests
+        max_requests = self.max_requests
+        window_ns = self._window_ns
+        cond = self.cond
+        monotonic = time.monotonic_ns
+
+        deadline = monotonic() + int(timeout * 1e9) if timeout is not None else None
+
+        async with cond:
+            while True:
+                now = monotonic()
+                cutoff = now - window_ns
+
+                # Check if we can make a request - room left, or the oldest is outside the window
+                if len(requests) < max_requests or requests[0] < cutoff:
+                    requests.append(now)
+                    if len(requests) < max_requests or requests[0] < cutoff:
+                        cond.notify()
+                    return True
+
+                if not block:
+                    return False
+
+                # Sleep until the oldest request leaves the window
+                wait_ns = requests[0] + window_ns - now
+
+                # Check timeout
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return False
+                    wait_ns = min(wait_ns, remaining)
+
+                try:
+                    await asyncio.wait_for(cond.wait(), timeout=max(0, wait_ns) / 1e9)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def wait(self):
+        """Wait until rate limit allows a request."""
+        await self.acquire()
+
+    def get_wait_time(self) -> float:
+        """Get estimated wait time until next request is allowed."""
+        requests = self.requests
+        if len(requests) < self.max_requests:
+            return 0.0
+
+        return max(0, requests[0] + self._window_ns - time.monotonic_ns()) / 1e9
+
+    async def reset(self):
         """Reset the rate limiter."""
-        with self.lock:
+        async with self.cond:
             self.requests.clear()
+            self.cond.notify_all()
 
 
 class MultiRateLimiter:
@@ -102,6 +319,8 @@ class MultiRateLimiter:
     Manages multiple rate limiters for different APIs.
     """
 
+    __slots__ = ('limiters',)
+
     def __init__(self):
         self.limiters: Dict[str, RateLimiter] = {}
 
@@ -111,28 +330,21 @@ class MultiRateLimiter:
 
     def acquire(self, name: str, block: bool = True) -> bool:
         """Acquire permission for a specific API."""
-        if name not in self.limiters:
+        limiter = self.limiters.get(name)
+        if limiter is None:
             return True  # No limiter = always allow
 
-        return self.limiters[name].acquire(block=block)
+        return limiter.acquire(block=block)
 
     def wait(self, name: str):
         """Wait for a specific API's rate limit."""
-        if name in self.limiters:
-            self.limiters[name].wait()
+        limiter = self.limiters.get(name)
+        if limiter is not None:
+            limiter.wait()
 
     def get_status(self) -> Dict:
         """Get status of all rate limiters."""
-        status = {}
-        for name, limiter in self.limiters.items():
-            with limiter.lock:
-                status[name] = {
-                    'max_requests': limiter.max_requests,
-                    'time_window': limiter.time_window,
-                    'current_requests': len(limiter.requests),
-                    'wait_time': limiter.get_wait_time(),
-                }
-        return status
+        return {name: limiter.get_status() for name, limiter in self.limiters.items()}
 
 
 # Pre-configured rate limiters for common APIs
@@ -149,8 +361,18 @@ api_limiters.add_limiter('discord', max_requests=30, time_window_seconds=60)
 def rate_limited(limiter_name: str):
     """Decorator to apply rate limiting to a function."""
     def decorator(func):
+        # Resolve the limiter once, not on every call
+        limiter = api_limiters.limiters.get(limiter_name)
+
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            api_limiters.wait(limiter_name)
+            nonlocal limiter
+            if limiter is None:
+                # The limiter may have been added after decoration
+                limiter = api_limiters.limiters.get(limiter_name)
+            if limiter is not None:
+                # Straight to acquire() - one call instead of going through wait()
+                limiter.acquire()
             return func(*args, **kwargs)
         return wrapper
     return decorator